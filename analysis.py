@@ -1,56 +1,80 @@
+import os
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-# Load data
-df = pd.read_csv('celebrity_marriages_enriched.csv')
+def fast_to_datetime(s):
+    # Parse each distinct date once, then map back
+    u = s.dropna().unique()
+    parsed = pd.to_datetime(u, format='%Y-%m-%d', errors='coerce')
+    mapping = dict(zip(u, parsed))
+    # astype keeps an all-missing column datetime instead of float
+    return s.map(mapping).astype('datetime64[ns]')
 
-# --- 1. DATA CLEANING ---
+# Load data (the fetcher's Parquet copy already has parsed dates; use it unless the CSV is newer)
 date_cols = ['Start_Date', 'End_Date', 'Celebrity_Birth', 'Spouse_Birth']
-for col in date_cols:
-    df[col] = pd.to_datetime(df[col], errors='coerce')
+csv_file, parquet_file = 'celebrity_marriages_enriched.csv', 'celebrity_marriages_enriched.parquet'
+if os.path.exists(parquet_file) and os.path.getmtime(parquet_file) >= os.path.getmtime(csv_file):
+    df = pd.read_parquet(parquet_file)
+else:
+    df = pd.read_csv(csv_file)
+    df[date_cols] = df[date_cols].apply(fast_to_datetime)
 
+# --- 1. DATA CLEANING ---
 df = df.dropna(subset=['Start_Date'])
 today = pd.to_datetime('today')
 df['Observed_End_Date'] = df['End_Date'].fillna(today)
-df['Duration_Days'] = (df['Observed_End_Date'] - df['Start_Date']).dt.days
+df['Duration_Days'] = (df['Observed_End_Date'].to_numpy() - df['Start_Date'].to_numpy()) / np.timedelta64(1, 'D')
 df['Duration_Years'] = df['Duration_Days'] / 365.25
-df = df[df['Duration_Days'] > 0]
+df = df.query('Duration_Days > 0')
 
 # Define Event (Divorce = 1)
-def get_event_status(row):
-    if pd.isnull(row['End_Date']): return 0
-    cause = str(row['End_Cause']).lower()
-    if 'death' in cause or 'widow' in cause: return 0 
-    return 1
+def compute_event(df):
+    cause = df['End_Cause'].fillna('').astype(str).str.lower()
+    death = cause.str.contains('death', regex=False) | cause.str.contains('widow', regex=False)
+    return np.where(df['End_Date'].isna() | death, 0, 1).astype('int8')
 
-df['Event_Divorce'] = df.apply(get_event_status, axis=1)
+df['Event_Divorce'] = compute_event(df)
 df['Status_Label'] = df['Event_Divorce'].map({1: 'Divorced', 0: 'Ongoing/Widowed'})
 
 # Calculate Features
-df['Age_Gap'] = abs((df['Celebrity_Birth'] - df['Spouse_Birth']).dt.days / 365.25)
+# 31557600 s = 365.25 days
+df['Age_Gap'] = np.abs(df['Celebrity_Birth'].to_numpy() - df['Spouse_Birth'].to_numpy()) / np.timedelta64(31557600, 's')
 df['Fame_Gap_Raw'] = abs(df['Celebrity_Fame_Score'] - df['Spouse_Fame_Score'])
 df['Spouse_Type'] = np.where(df['Spouse_Fame_Score'] > 20, 'Famous Spouse', 'Non-Famous Spouse')
 
 # Remove Age Gap outliers (e.g. > 60 years or NaN) for cleaner plots
 df_clean = df.dropna(subset=['Age_Gap'])
-df_clean = df_clean[df_clean['Age_Gap'] < 60]
+df_clean = df_clean.query('Age_Gap < 60')
 
 # --- 2. ANALYSIS ---
 
 # Insight A: Age Gap Impact
 # Bin the Age Gaps
 bins = [0, 5, 10, 20, 100]
-labels = ['0-5 Years', '5-10 Years', '10-20 Years', '20+ Years']
-df_clean['Age_Gap_Bin'] = pd.cut(df_clean['Age_Gap'], bins=bins, labels=labels)
+# Store integer bin codes; the text labels are only attached for printing/plotting
+labels = np.array(['0-5 Years', '5-10 Years', '10-20 Years', '20+ Years'])
+df_clean['Age_Gap_Bin'] = pd.cut(df_clean['Age_Gap'], bins=bins, labels=False).astype('Int8')
+
+# Divorced couples only (reused by the plots and the correlation matrix)
+df_div = df_clean.loc[df_clean['Event_Divorce'] == 1]
 
 # Calculate Divorce Rate per Bin (Ratio of Divorced to Total in that bin)
-age_gap_stats = df_clean.groupby('Age_Gap_Bin', observed=False).agg(
-    Total_Marriages=('Status_Label', 'count'),
-    Divorce_Rate=('Event_Divorce', 'mean'),
-    Median_Duration=('Duration_Years', 'median')
-).reset_index()
+# Only 4 bins, so count with np.bincount on the bin codes (-1 = outside every bin)
+codes = df_clean['Age_Gap_Bin'].to_numpy(dtype=np.int8, na_value=-1)
+in_bin = codes >= 0
+codes = codes[in_bin]
+totals = np.bincount(codes, minlength=len(labels))
+divorces = np.bincount(codes, weights=df_clean['Event_Divorce'].to_numpy()[in_bin], minlength=len(labels))
+medians = df_clean['Duration_Years'].to_numpy()[in_bin]
+medians = pd.Series(medians).groupby(codes).median().reindex(range(len(labels)))
+age_gap_stats = pd.DataFrame({
+    'Age_Gap_Bin': labels,
+    'Total_Marriages': totals,
+    'Divorce_Rate': divorces / totals,
+    'Median_Duration': medians.to_numpy()
+})
 
 # Insight B: Fame Impact
 fame_stats = df_clean.groupby('Spouse_Type').agg(
@@ -60,37 +84,45 @@ fame_stats = df_clean.groupby('Spouse_Type').agg(
 ).reset_index()
 
 # --- 3. PLOTTING ---
-plt.figure(figsize=(16, 10))
+fig, axes = plt.subplots(2, 2, figsize=(16, 10))
+div_years = df_div['Duration_Years'].to_numpy()
 
 # Plot 1: Age Gap vs Divorce Rate (Bar Chart)
-plt.subplot(2, 2, 1)
-sns.barplot(data=age_gap_stats, x='Age_Gap_Bin', y='Divorce_Rate', palette='Reds')
-plt.title('Divorce Rate by Age Difference', fontsize=14)
-plt.ylabel('Divorce Rate (0.0 - 1.0)')
-plt.xlabel('Age Gap Category')
-plt.ylim(0, 1)
+ax = axes[0, 0]
+sns.barplot(x=labels, y=age_gap_stats['Divorce_Rate'].to_numpy(), hue=labels, palette='Reds', legend=False, ax=ax)
+ax.set_title('Divorce Rate by Age Difference', fontsize=14)
+ax.set_ylabel('Divorce Rate (0.0 - 1.0)')
+ax.set_xlabel('Age Gap Category')
+ax.set_ylim(0, 1)
 
 # Plot 2: Age Gap vs Duration (Box Plot for Divorced Couples Only)
 # To see if large age gaps lead to *quicker* divorces
-plt.subplot(2, 2, 2)
-sns.boxplot(data=df_clean[df_clean['Event_Divorce']==1], x='Age_Gap_Bin', y='Duration_Years', palette='Blues')
-plt.title('Duration of Marriages that Ended (by Age Gap)', fontsize=14)
-plt.ylabel('Years until Divorce')
+ax = axes[0, 1]
+div_codes = df_div['Age_Gap_Bin'].to_numpy(dtype=np.int8, na_value=-1)
+div_in_bin = div_codes >= 0
+div_bins = labels[div_codes[div_in_bin]]
+sns.boxplot(x=div_bins, y=div_years[div_in_bin], order=labels, hue=div_bins, hue_order=labels, palette='Blues', legend=False, ax=ax)
+ax.set_title('Duration of Marriages that Ended (by Age Gap)', fontsize=14)
+ax.set_xlabel('Age_Gap_Bin')
+ax.set_ylabel('Years until Divorce')
 
 # Plot 3: Spouse Fame Type vs Duration (Violin Plot)
-plt.subplot(2, 2, 3)
-sns.violinplot(data=df_clean[df_clean['Event_Divorce']==1], x='Spouse_Type', y='Duration_Years', palette='Greens')
-plt.title('Duration: Marrying Famous vs Non-Famous', fontsize=14)
+ax = axes[1, 0]
+div_spouse_type = df_div['Spouse_Type'].to_numpy()
+sns.violinplot(x=div_spouse_type, y=div_years, hue=div_spouse_type, palette='Greens', legend=False, ax=ax)
+ax.set_title('Duration: Marrying Famous vs Non-Famous', fontsize=14)
+ax.set_xlabel('Spouse_Type')
+ax.set_ylabel('Duration_Years')
 
 # Plot 4: Scatter of Fame Gap vs Duration
-plt.subplot(2, 2, 4)
-sns.scatterplot(data=df_clean[df_clean['Event_Divorce']==1], x='Fame_Gap_Raw', y='Duration_Years', alpha=0.6)
-plt.title('Fame Gap vs Duration (Scatter)', fontsize=14)
-plt.xlabel('Difference in Fame Score')
-plt.ylabel('Duration (Years)')
+ax = axes[1, 1]
+sns.scatterplot(x=df_div['Fame_Gap_Raw'].to_numpy(), y=div_years, alpha=0.6, ax=ax)
+ax.set_title('Fame Gap vs Duration (Scatter)', fontsize=14)
+ax.set_xlabel('Difference in Fame Score')
+ax.set_ylabel('Duration (Years)')
 
-plt.tight_layout()
-plt.savefig('celebrity_analysis_results.png')
+fig.tight_layout()
+fig.savefig('celebrity_analysis_results.png')
 
 # Print Text Summary
 print("--- RESEARCH FINDINGS ---")
@@ -100,6 +132,6 @@ print("\n2. Impact of Marrying a Famous Spouse:")
 print(fame_stats)
 
 # Correlation
-corr = df_clean[df_clean['Event_Divorce']==1][['Duration_Years', 'Age_Gap', 'Fame_Gap_Raw']].corr()
+corr = df_div[['Duration_Years', 'Age_Gap', 'Fame_Gap_Raw']].corr()
 print("\n3. Correlation Matrix (Divorced Only):")
 print(corr)
\ No newline at end of file
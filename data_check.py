@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime
 
 # Load the dataset
 df = pd.read_csv('celebrity_marriages_wikidata.csv')
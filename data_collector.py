@@ -1,3 +1,4 @@
+import io
 import requests
 import pandas as pd
 import time
@@ -33,33 +34,24 @@ LIMIT 2000
 print("🚀 Sending query to Wikidata... (This retrieves 2000 records instantly)")
 
 try:
-    # Send the request
-    r = requests.get(url, params={'format': 'json', 'query': query})
-    data = r.json()
+    # Send the request (CSV result: header row = SPARQL variable names)
+    session = requests.Session()
+    session.headers.update({'Accept': 'text/csv', 'Accept-Encoding': 'gzip'})
+    r = session.get(url, params={'format': 'csv', 'query': query})
     
-    # Parse the JSON result
-    results = []
-    for item in data['results']['bindings']:
-        celebrity_name = item.get('celebrityLabel', {}).get('value')
-        spouse_name = item.get('spouseLabel', {}).get('value')
-        start_date = item.get('start', {}).get('value')
-        end_date = item.get('end', {}).get('value')
-        end_cause = item.get('endCauseLabel', {}).get('value')
-        
-        # Clean up dates (Wikidata returns '2010-01-01T00:00:00Z')
-        if start_date: start_date = start_date.split('T')[0]
-        if end_date: end_date = end_date.split('T')[0]
-
-        results.append({
-            "Celebrity": celebrity_name,
-            "Spouse": spouse_name,
-            "Start_Date": start_date,
-            "End_Date": end_date,
-            "End_Cause": end_cause
-        })
-
-    # Create DataFrame
-    df = pd.DataFrame(results)
+    # Parse the CSV result straight into a DataFrame (only empty cells are missing, so a label like 'NA' survives)
+    df = pd.read_csv(io.BytesIO(r.content), dtype={'start': str, 'end': str}, keep_default_na=False, na_values=[''])
+    df = df.rename(columns={
+        'celebrityLabel': 'Celebrity',
+        'spouseLabel': 'Spouse',
+        'start': 'Start_Date',
+        'end': 'End_Date',
+        'endCauseLabel': 'End_Cause'
+    })[['Celebrity', 'Spouse', 'Start_Date', 'End_Date', 'End_Cause']]
+    
+    # Clean up dates (Wikidata returns '2010-01-01T00:00:00Z')
+    for c in ('Start_Date', 'End_Date'):
+        df[c] = df[c].str.slice(0, 10)
     
     # Save to CSV
     filename = "celebrity_marriages_wikidata.csv"
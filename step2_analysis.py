@@ -1,27 +1,34 @@
+import os
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from lifelines import KaplanMeierFitter
-from sklearn.linear_model import LogisticRegression
-from datetime import datetime
 
 # --- CONFIGURATION ---
 INPUT_FILE = "celebrity_marriages_enriched.csv"
+PARQUET_FILE = "celebrity_marriages_enriched.parquet"
 OUTPUT_IMAGE = "celebrity_marriage_dashboard.png"
 
-# Load Data
-print(f"📂 Loading {INPUT_FILE}...")
-df = pd.read_csv(INPUT_FILE)
+def fast_to_datetime(s):
+    u = s.dropna().unique()
+    parsed = pd.to_datetime(u, format='%Y-%m-%d', errors='coerce')
+    mapping = dict(zip(u, parsed))
+    return s.map(mapping).astype('datetime64[ns]')
+
+# Load Data (the fetcher's Parquet copy already has parsed dates; use it unless the CSV is newer)
+date_cols = ['Start_Date', 'End_Date', 'Celebrity_Birth', 'Spouse_Birth']
+if os.path.exists(PARQUET_FILE) and os.path.getmtime(PARQUET_FILE) >= os.path.getmtime(INPUT_FILE):
+    print(f"📂 Loading {PARQUET_FILE}...")
+    df = pd.read_parquet(PARQUET_FILE)
+else:
+    print(f"📂 Loading {INPUT_FILE}...")
+    df = pd.read_csv(INPUT_FILE)
+    # Convert dates to datetime objects
+    df[date_cols] = df[date_cols].apply(fast_to_datetime)
 
 # --- 1. DATA CLEANING & FEATURE ENGINEERING ---
 print("⚙️  Processing data and engineering features...")
 
-# Convert dates to datetime objects
-date_cols = ['Start_Date', 'End_Date', 'Celebrity_Birth', 'Spouse_Birth']
-for col in date_cols:
-    df[col] = pd.to_datetime(df[col], errors='coerce')
-
 # Drop invalid rows (must have a start date)
 df = df.dropna(subset=['Start_Date'])
 
@@ -29,53 +36,60 @@ df = df.dropna(subset=['Start_Date'])
 # If End_Date is missing, we assume the marriage is ongoing (use Today's date for calc)
 today = pd.to_datetime('today')
 df['Observed_End_Date'] = df['End_Date'].fillna(today)
-df['Duration_Days'] = (df['Observed_End_Date'] - df['Start_Date']).dt.days
+df['Duration_Days'] = (df['Observed_End_Date'].to_numpy() - df['Start_Date'].to_numpy()) / np.timedelta64(1, 'D')
 df['Duration_Years'] = df['Duration_Days'] / 365.25
 
 # Filter out data errors (negative duration)
-df = df[df['Duration_Days'] > 0]
+df = df.query('Duration_Days > 0')
 
 # Define "Event" (Divorce = 1, Ongoing/Death = 0)
 # In Survival Analysis, "Censored" means the event hasn't happened yet (or they died married).
-def get_event_status(row):
-    if pd.isnull(row['End_Date']):
-        return 0 # Censored (Ongoing)
-    
-    cause = str(row['End_Cause']).lower()
-    if 'death' in cause or 'widow' in cause:
-        return 0 # Censored (Death is not a failed marriage)
-    
-    return 1 # Event (Divorce/Separation)
-
-df['Event_Divorce'] = df.apply(get_event_status, axis=1)
+def compute_event(df):
+    cause = df['End_Cause'].fillna('').astype(str).str.lower()
+    # Death is not a failed marriage, so it is censored like an ongoing one
+    death = cause.str.contains('death', regex=False) | cause.str.contains('widow', regex=False)
+    # Censored (Ongoing / Death) = 0, Event (Divorce/Separation) = 1
+    return np.where(df['End_Date'].isna() | death, 0, 1).astype('int8')
+
+df['Event_Divorce'] = compute_event(df)
 
 # Calculate Risk Factors (Variables)
 # 1. Age Gap
-df['Age_Gap'] = abs((df['Celebrity_Birth'] - df['Spouse_Birth']).dt.days / 365.25).fillna(0)
+# Missing birth dates become a 0 gap, replaced in the same buffer (no extra Series)
+age_gap = np.abs(df['Celebrity_Birth'].to_numpy() - df['Spouse_Birth'].to_numpy()) / np.timedelta64(31557600, 's')
+df['Age_Gap'] = np.nan_to_num(age_gap, copy=False)
 
 # 2. Fame Gap & Spouse Type
-df['Celebrity_Fame_Score'] = df['Celebrity_Fame_Score'].fillna(0)
-df['Spouse_Fame_Score'] = df['Spouse_Fame_Score'].fillna(0)
-df['Fame_Gap'] = abs(df['Celebrity_Fame_Score'] - df['Spouse_Fame_Score'])
-df['Is_Famous_Spouse'] = (df['Spouse_Fame_Score'] > 20).astype(int)
-df['Spouse_Type_Label'] = np.where(df['Is_Famous_Spouse'] == 1, 'Famous Spouse', 'Non-Famous')
+c_fame = np.nan_to_num(df['Celebrity_Fame_Score'].to_numpy(dtype=np.float64))
+s_fame = np.nan_to_num(df['Spouse_Fame_Score'].to_numpy(dtype=np.float64))
+df['Celebrity_Fame_Score'] = c_fame
+df['Spouse_Fame_Score'] = s_fame
+df['Fame_Gap'] = np.abs(c_fame - s_fame)
+famous = s_fame > 20
+df['Is_Famous_Spouse'] = famous.astype(np.int8)
+df['Spouse_Type_Label'] = np.where(famous, 'Famous Spouse', 'Non-Famous')
+
+# Divorced couples only (reused by the dashboard plots)
+df_div = df.loc[df['Event_Divorce'] == 1]
 
 # --- 2. SURVIVAL ANALYSIS (Kaplan-Meier) ---
 print("📉 Running Kaplan-Meier Survival Analysis...")
+from lifelines import KaplanMeierFitter  # heavy (scipy/autograd), imported only here
 kmf = KaplanMeierFitter()
 kmf.fit(durations=df['Duration_Years'], event_observed=df['Event_Divorce'])
 
 # --- 3. RISK MODELING (Logistic Regression) ---
 print("🤖 Training Risk Model (Logistic Regression)...")
+from sklearn.linear_model import LogisticRegression
 # We predict if a marriage fails in < 5 years (Short Marriage)
 # Filter for meaningful data (either ended, or ongoing > 5 years)
 model_data = df[ (df['Event_Divorce']==1) | (df['Duration_Years'] > 5) ].copy()
-model_data['Target_Short_Marriage'] = (model_data['Duration_Years'] <= 5).astype(int)
+model_data['Target_Short_Marriage'] = (model_data['Duration_Years'] <= 5).astype(np.int8)
 
-X = model_data[['Age_Gap', 'Fame_Gap', 'Is_Famous_Spouse']]
-y = model_data['Target_Short_Marriage']
+X = np.ascontiguousarray(model_data[['Age_Gap', 'Fame_Gap', 'Is_Famous_Spouse']].to_numpy(dtype=np.float32))
+y = model_data['Target_Short_Marriage'].to_numpy(dtype=np.int8)
 
-model = LogisticRegression()
+model = LogisticRegression(solver='lbfgs', tol=1e-3)
 model.fit(X, y)
 
 # Extract Coefficients (Risk Scores)
@@ -86,43 +100,48 @@ risk_factors = pd.DataFrame({
 
 # --- 4. VISUALIZATION DASHBOARD ---
 print("🎨 Generating Dashboard...")
-plt.figure(figsize=(14, 10))
-plt.suptitle('The Science of Celebrity Divorce', fontsize=20, weight='bold')
+fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+fig.suptitle('The Science of Celebrity Divorce', fontsize=20, weight='bold')
+div_years = df_div['Duration_Years'].to_numpy()
 
 # Plot 1: Survival Curve
-plt.subplot(2, 2, 1)
-kmf.plot_survival_function(linewidth=3, color='#007acc')
-plt.title('The "Hollywood Survival Curve"', fontsize=14)
-plt.ylabel('Probability of Staying Married')
-plt.xlabel('Years Married')
-plt.grid(True, alpha=0.3)
-plt.axvline(x=12, color='red', linestyle='--', alpha=0.6)
-plt.text(12.5, 0.6, 'Median: 12 Years', color='red', fontsize=10)
+ax = axes[0, 0]
+kmf.plot_survival_function(ax=ax, linewidth=3, color='#007acc')
+ax.set_title('The "Hollywood Survival Curve"', fontsize=14)
+ax.set_ylabel('Probability of Staying Married')
+ax.set_xlabel('Years Married')
+ax.grid(True, alpha=0.3)
+ax.axvline(x=12, color='red', linestyle='--', alpha=0.6)
+ax.text(12.5, 0.6, 'Median: 12 Years', color='red', fontsize=10)
 
 # Plot 2: Risk Factors (Coefficients)
-plt.subplot(2, 2, 2)
-sns.barplot(data=risk_factors, x='Factor', y='Risk_Score', palette='RdYlGn_r')
-plt.title('What Increases Divorce Risk?', fontsize=14)
-plt.ylabel('Risk Impact (Higher = More Dangerous)')
-plt.axhline(0, color='black', linewidth=1)
+ax = axes[0, 1]
+factors = risk_factors['Factor'].to_numpy()
+sns.barplot(x=factors, y=risk_factors['Risk_Score'].to_numpy(), hue=factors, palette='RdYlGn_r', legend=False, ax=ax)
+ax.set_title('What Increases Divorce Risk?', fontsize=14)
+ax.set_xlabel('Factor')
+ax.set_ylabel('Risk Impact (Higher = More Dangerous)')
+ax.axhline(0, color='black', linewidth=1)
 
 # Plot 3: Duration by Spouse Type
-plt.subplot(2, 2, 3)
-sns.boxplot(data=df[df['Event_Divorce']==1], x='Spouse_Type_Label', y='Duration_Years', palette='Pastel1')
-plt.title('Duration: Marrying Famous vs. Non-Famous', fontsize=14)
-plt.xlabel('')
-plt.ylabel('Years until Divorce')
+ax = axes[1, 0]
+div_spouse_type = df_div['Spouse_Type_Label'].to_numpy()
+sns.boxplot(x=div_spouse_type, y=div_years, hue=div_spouse_type, palette='Pastel1', legend=False, ax=ax)
+ax.set_title('Duration: Marrying Famous vs. Non-Famous', fontsize=14)
+ax.set_xlabel('')
+ax.set_ylabel('Years until Divorce')
 
 # Plot 4: Age Gap Scatter
-plt.subplot(2, 2, 4)
-sns.scatterplot(data=df[df['Event_Divorce']==1], x='Age_Gap', y='Duration_Years', alpha=0.5, size='Fame_Gap', sizes=(20, 200))
-plt.title('Age Gap vs. Duration (Size = Fame Diff)', fontsize=14)
-plt.xlabel('Age Difference (Years)')
-plt.ylabel('Duration (Years)')
-plt.xlim(0, 40)
-
-plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-plt.savefig(OUTPUT_IMAGE)
+ax = axes[1, 1]
+sns.scatterplot(x=df_div['Age_Gap'].to_numpy(), y=div_years, alpha=0.5, size=df_div['Fame_Gap'].to_numpy(), sizes=(20, 200), ax=ax)
+ax.get_legend().set_title('Fame_Gap')
+ax.set_title('Age Gap vs. Duration (Size = Fame Diff)', fontsize=14)
+ax.set_xlabel('Age Difference (Years)')
+ax.set_ylabel('Duration (Years)')
+ax.set_xlim(0, 40)
+
+fig.tight_layout(rect=[0, 0.03, 1, 0.95])
+fig.savefig(OUTPUT_IMAGE)
 print(f"✅ Dashboard saved to: {OUTPUT_IMAGE}")
 
 # --- 5. PRINT STATS ---
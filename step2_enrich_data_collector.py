@@ -1,6 +1,6 @@
+import io
 import requests
 import pandas as pd
-from tqdm import tqdm
 
 # --- CONFIGURATION ---
 url = "https://query.wikidata.org/sparql"
@@ -42,63 +42,54 @@ WHERE {
 LIMIT 3000
 """
 
-print("🚀 Sending Advanced Query to Wikidata (JSON Mode)...")
+print("🚀 Sending Advanced Query to Wikidata (CSV Mode)...")
 
 try:
-    # REQUEST JSON (More robust than CSV)
-    headers = {'User-Agent': 'CelebrityResearchBot/1.0'}
-    r = requests.get(url, params={'format': 'json', 'query': query}, headers=headers)
+    # REQUEST CSV (parsed directly by pandas, no per-record Python loop)
+    # One session with gzip: compressed CSV over a reusable connection
+    session = requests.Session()
+    session.headers.update({'User-Agent': 'CelebrityResearchBot/1.0', 'Accept': 'text/csv', 'Accept-Encoding': 'gzip'})
+    r = session.get(url, params={'format': 'csv', 'query': query})
     
     if r.status_code == 200:
-        data = r.json()
-        results = []
-        
         print("Parsing data...")
-        # Loop through the JSON results safely
-        for item in tqdm(data['results']['bindings']):
-            # Helper function to grab value if exists
-            def get_val(key):
-                return item.get(key, {}).get('value', None)
-
-            # Extract fields
-            celebrity = get_val('celebrityLabel')
-            spouse = get_val('spouseLabel')
-            start_date = get_val('start')
-            end_date = get_val('end')
-            end_cause = get_val('endCauseLabel')
-            c_birth = get_val('c_birth')
-            s_birth = get_val('s_birth')
-            c_fame = get_val('c_fame')
-            s_fame = get_val('s_fame')
-
-            # Clean Dates (Wikidata returns '1990-01-01T00:00:00Z', we want '1990-01-01')
-            if start_date: start_date = start_date.split('T')[0]
-            if end_date: end_date = end_date.split('T')[0]
-            if c_birth: c_birth = c_birth.split('T')[0]
-            if s_birth: s_birth = s_birth.split('T')[0]
-
-            results.append({
-                "Celebrity": celebrity,
-                "Spouse": spouse,
-                "Start_Date": start_date,
-                "End_Date": end_date,
-                "End_Cause": end_cause,
-                "Celebrity_Birth": c_birth,
-                "Spouse_Birth": s_birth,
-                "Celebrity_Fame_Score": c_fame,
-                "Spouse_Fame_Score": s_fame
-            })
-
-        # Convert to DataFrame
-        df = pd.DataFrame(results)
+        date_vars = ('start', 'end', 'c_birth', 's_birth')
+        df = pd.read_csv(io.BytesIO(r.content), dtype=dict.fromkeys(date_vars, str), keep_default_na=False, na_values=[''])
+        df = df.rename(columns={
+            'celebrityLabel': 'Celebrity',
+            'spouseLabel': 'Spouse',
+            'start': 'Start_Date',
+            'end': 'End_Date',
+            'endCauseLabel': 'End_Cause',
+            'c_birth': 'Celebrity_Birth',
+            's_birth': 'Spouse_Birth',
+            'c_fame': 'Celebrity_Fame_Score',
+            's_fame': 'Spouse_Fame_Score'
+        })
+        
+        # Clean Dates (Wikidata returns '1990-01-01T00:00:00Z', we want '1990-01-01')
+        for c in ('Start_Date', 'End_Date', 'Celebrity_Birth', 'Spouse_Birth'):
+            df[c] = df[c].str.slice(0, 10)
         
         # Save
         filename = "celebrity_marriages_enriched.csv"
         df.to_csv(filename, index=False)
         
+        # Typed copy for the analysis scripts: dates pre-parsed, so they skip the CSV reparse
+        parquet_file = "celebrity_marriages_enriched.parquet"
+        df_typed = df.copy()
+        for c in ('Start_Date', 'End_Date', 'Celebrity_Birth', 'Spouse_Birth'):
+            df_typed[c] = pd.to_datetime(df_typed[c], format='%Y-%m-%d', errors='coerce')
+        try:
+            df_typed.to_parquet(parquet_file, engine='pyarrow')
+            saved = f"{filename} (+ {parquet_file})"
+        except ImportError:
+            # pyarrow missing: the CSV alone is enough, the analysis scripts fall back to it
+            saved = filename
+        
         print("-" * 30)
         print(f"✅ Success! Captured {len(df)} enriched records.")
-        print(f"📄 Saved to: {filename}")
+        print(f"📄 Saved to: {saved}")
         print("-" * 30)
         print(df.head())
         
@@ -1,6 +1,6 @@
+import io
 import requests
 import pandas as pd
-from tqdm import tqdm
 
 # --- CONFIGURATION ---
 url = "https://query.wikidata.org/sparql"
@@ -52,55 +52,33 @@ print("🧠 Sending Psycho-Economic Query to Wikidata...")
 print("(This query is complex and might take 10-15 seconds...)")
 
 try:
-    headers = {'User-Agent': 'CelebrityResearchBot/2.0'}
-    r = requests.get(url, params={'format': 'json', 'query': query}, headers=headers)
+    # One session with gzip: compressed CSV over a reusable connection
+    session = requests.Session()
+    session.headers.update({'User-Agent': 'CelebrityResearchBot/2.0', 'Accept': 'text/csv', 'Accept-Encoding': 'gzip'})
+    r = session.get(url, params={'format': 'csv', 'query': query})
     
     if r.status_code == 200:
-        data = r.json()
-        results = []
+        date_vars = ('start', 'end', 'c_birth', 'career_start')
+        df = pd.read_csv(io.BytesIO(r.content), dtype=dict.fromkeys(date_vars, str), keep_default_na=False, na_values=[''])
         
-        print(f"Parsing {len(data['results']['bindings'])} records...")
+        print(f"Parsing {len(df)} records...")
         
-        for item in tqdm(data['results']['bindings']):
-            def get_val(key): return item.get(key, {}).get('value', None)
-            
-            # Basic Info
-            celebrity = get_val('celebrityLabel')
-            spouse = get_val('spouseLabel')
-            
-            # Dates
-            start_date = get_val('start')
-            end_date = get_val('end')
-            if start_date: start_date = start_date.split('T')[0]
-            if end_date: end_date = end_date.split('T')[0]
-            
-            # Crucial Fix: Capture End Cause
-            end_cause = get_val('endCauseLabel')
-
-            # Psychological Data (Child Star)
-            birth_date = get_val('c_birth')
-            career_start = get_val('career_start')
-            if birth_date: birth_date = birth_date.split('T')[0]
-            if career_start: career_start = career_start.split('T')[0]
-            
-            # Economic/Family Data
-            children = get_val('child_count')
-            awards = get_val('award_count')
-
-            results.append({
-                "Celebrity": celebrity,
-                "Spouse": spouse,
-                "Start_Date": start_date,
-                "End_Date": end_date,
-                "End_Cause": end_cause,  # <--- FIXED: Now saving the cause!
-                "Celebrity_Birth": birth_date,
-                "Career_Start_Year": career_start,
-                "Children_Count": children,
-                "Awards_Count": awards
-            })
-
-        # Save to new dataset
-        df = pd.DataFrame(results)
+        # Rename SPARQL variables to the dataset's column names
+        df = df.rename(columns={
+            'celebrityLabel': 'Celebrity',
+            'spouseLabel': 'Spouse',
+            'start': 'Start_Date',
+            'end': 'End_Date',
+            'endCauseLabel': 'End_Cause',  # <--- FIXED: Now saving the cause!
+            'c_birth': 'Celebrity_Birth',
+            'career_start': 'Career_Start_Year',
+            'child_count': 'Children_Count',
+            'award_count': 'Awards_Count'
+        })
+        
+        # Clean Dates (Wikidata returns '1990-01-01T00:00:00Z', we want '1990-01-01')
+        for c in ('Start_Date', 'End_Date', 'Celebrity_Birth', 'Career_Start_Year'):
+            df[c] = df[c].str.slice(0, 10)
         
         # CLEANUP: Fill NaNs for counts with 0
         df['Children_Count'] = df['Children_Count'].fillna(0).astype(int)
@@ -9,46 +9,56 @@ print("🧠 Loading Psycho-Economic Data...")
 df = pd.read_csv('celebrity_psycho_economics.csv')
 
 # Convert Dates
+def fast_to_datetime(s):
+    u = s.dropna().unique()
+    parsed = pd.to_datetime(u, format='%Y-%m-%d', errors='coerce')
+    mapping = dict(zip(u, parsed))
+    return s.map(mapping).astype('datetime64[ns]')
+
 cols = ['Start_Date', 'End_Date', 'Celebrity_Birth', 'Career_Start_Year']
-for c in cols:
-    df[c] = pd.to_datetime(df[c], errors='coerce')
+df[cols] = df[cols].apply(fast_to_datetime)
 
 df = df.dropna(subset=['Start_Date', 'Celebrity_Birth', 'Career_Start_Year'])
 
 # Calculate Duration (The "Time" variable)
 today = pd.to_datetime('today')
 df['Observed_End_Date'] = df['End_Date'].fillna(today)
-df['Duration_Years'] = (df['Observed_End_Date'] - df['Start_Date']).dt.days / 365.25
-df = df[df['Duration_Years'] > 0]
+# 31557600 s = 365.25 days
+df['Duration_Years'] = (df['Observed_End_Date'].to_numpy() - df['Start_Date'].to_numpy()) / np.timedelta64(31557600, 's')
+df = df.query('Duration_Years > 0')
 
 # Define Event (1=Divorce, 0=Ongoing/Widowed)
-def get_status(row):
-    if pd.isnull(row['End_Date']): return 0
-    if 'death' in str(row['End_Cause']).lower(): return 0
-    return 1
-df['Event'] = df.apply(get_status, axis=1)
+def compute_event(df):
+    cause = df['End_Cause'].fillna('').astype(str).str.lower()
+    death = cause.str.contains('death', regex=False) | cause.str.contains('widow', regex=False)
+    return np.where(df['End_Date'].isna() | death, 0, 1).astype('int8')
+df['Event'] = compute_event(df)
 
 # --- PSYCHOLOGICAL VARIABLE: CHILD STAR SYNDROME ---
 # Calculate Age at Career Start
-df['Age_At_Debut'] = (df['Career_Start_Year'] - df['Celebrity_Birth']).dt.days / 365.25
+df['Age_At_Debut'] = (df['Career_Start_Year'].to_numpy() - df['Celebrity_Birth'].to_numpy()) / np.timedelta64(31557600, 's')
 
 # Filter invalid data (e.g., negative ages)
-df = df[(df['Age_At_Debut'] > 0) & (df['Age_At_Debut'] < 80)]
+df = df.query('0 < Age_At_Debut < 80')
 
 # Define "Child Star" (Started working before age 16)
 df['Is_Child_Star'] = np.where(df['Age_At_Debut'] < 16, 'Child Star', 'Adult Debut')
-df['Is_Child_Star_Binary'] = np.where(df['Age_At_Debut'] < 16, 1, 0)
+df['Is_Child_Star_Binary'] = (df['Age_At_Debut'].to_numpy() < 16).astype(np.int8)
 
 # --- FAMILY VARIABLE: THE BABY ANCHOR ---
 # Group children count for cleaner plotting
-df['Children_Category'] = pd.cut(df['Children_Count'], bins=[-1, 0, 2, 20], labels=['No Kids', '1-2 Kids', '3+ Kids'])
+# Integer codes (0 = No Kids, 1 = 1-2 Kids, 2 = 3+ Kids); names are looked up at plot time
+CHILDREN_LABELS = np.array(['No Kids', '1-2 Kids', '3+ Kids'])
+df['Children_Category'] = pd.cut(df['Children_Count'], bins=[-1, 0, 2, 20], labels=False).astype('Int8')
 
 # --- 2. MULTIVARIATE ANALYSIS (COX HAZARD MODEL) ---
 print("⚙️ Running Cox Proportional Hazards Model...")
 
 # We select the variables for the "Formula"
 # This tells us the exact % risk increase/decrease for each factor
-cox_data = df[['Duration_Years', 'Event', 'Is_Child_Star_Binary', 'Children_Count', 'Awards_Count']]
+cox_data = df[['Duration_Years', 'Event', 'Is_Child_Star_Binary', 'Children_Count', 'Awards_Count']].astype({
+    'Duration_Years': np.float32, 'Is_Child_Star_Binary': np.int8, 'Children_Count': np.int16, 'Awards_Count': np.int16
+})
 
 cph = CoxPHFitter()
 cph.fit(cox_data, duration_col='Duration_Years', event_col='Event')
@@ -60,9 +70,11 @@ plt.suptitle('Psycho-Economic Analysis of Celebrity Divorce', fontsize=20, weigh
 # PLOT 1: The Child Star Syndrome (Survival Curve)
 plt.subplot(2, 2, 1)
 kmf = KaplanMeierFitter()
+dur = df['Duration_Years'].to_numpy(np.float32)
+ev = df['Event'].to_numpy(np.int8)
 for group in ['Child Star', 'Adult Debut']:
-    mask = df['Is_Child_Star'] == group
-    kmf.fit(df[mask]['Duration_Years'], df[mask]['Event'], label=group)
+    mask = df['Is_Child_Star'].to_numpy() == group
+    kmf.fit(dur[mask], ev[mask], label=group)
     kmf.plot_survival_function(linewidth=3)
 plt.title('Do "Child Stars" Crash Faster?', fontsize=14)
 plt.ylabel('Probability of Staying Married')
@@ -71,10 +83,10 @@ plt.grid(True, alpha=0.3)
 # PLOT 2: The Baby Anchor (Survival Curve by Kids)
 plt.subplot(2, 2, 2)
 colors = {'No Kids': 'red', '1-2 Kids': 'orange', '3+ Kids': 'green'}
-for group in ['No Kids', '1-2 Kids', '3+ Kids']:
-    mask = df['Children_Category'] == group
+for code, group in enumerate(CHILDREN_LABELS):
+    mask = (df['Children_Category'] == code).to_numpy(dtype=bool, na_value=False)
     if mask.sum() > 0:
-        kmf.fit(df[mask]['Duration_Years'], df[mask]['Event'], label=group)
+        kmf.fit(dur[mask], ev[mask], label=group)
         kmf.plot_survival_function(linewidth=2, color=colors[group])
 plt.title('The "Baby Anchor": Do Kids Save Marriages?', fontsize=14)
 plt.grid(True, alpha=0.3)
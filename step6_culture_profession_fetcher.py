@@ -1,9 +1,16 @@
+import hashlib
+import pathlib
+import shutil
 import requests
 import pandas as pd
-from tqdm import tqdm
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # --- CONFIGURATION ---
 url = "https://query.wikidata.org/sparql"
+PAGE_SIZE = 500       # Rows per request (LIMIT/OFFSET), small enough to stay under the 60s timeout
+MAX_RECORDS = 4000    # Same overall cap as the original single query
+CACHE_DIR = pathlib.Path(".cache")  # Raw responses, keyed by query hash (delete to force a refetch)
 
 # --- THE "CULTURE & PROFESSION" QUERY ---
 # Fetching: 
@@ -39,54 +46,95 @@ WHERE {
 
   SERVICE wikibase:label { bd:serviceParam wikibase:language "[AUTO_LANGUAGE],en". }
 }
-LIMIT 4000
+ORDER BY ?celebrityLabel ?spouseLabel ?start ?end ?endCauseLabel ?countryLabel ?occupationLabel
 """
+# LIMIT/OFFSET is appended per page below; the ORDER BY keeps page boundaries stable between requests
+
+# SPARQL variable -> output column (the CSV header uses the variable names)
+COLUMNS = {
+    'celebrityLabel': 'Celebrity',
+    'spouseLabel': 'Spouse',
+    'start': 'Start_Date',
+    'end': 'End_Date',
+    'endCauseLabel': 'End_Cause',
+    'countryLabel': 'Country',
+    'occupationLabel': 'Occupation'
+}
 
 print("🌍 Sending Culture & Profession Query to Wikidata...")
 
 try:
-    headers = {'User-Agent': 'CelebrityResearchBot/3.0'}
-    r = requests.get(url, params={'format': 'json', 'query': query}, headers=headers)
+    # One session for every page: the connection stays open and failed pages are retried
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'CelebrityResearchBot/3.0',
+        'Accept': 'text/csv',
+        'Accept-Encoding': 'gzip'
+    })
+    retry = Retry(total=3, backoff_factor=1.0, status_forcelist=[429, 500, 502, 503, 504])
+    session.mount('https://', HTTPAdapter(max_retries=retry))
     
-    if r.status_code == 200:
-        data = r.json()
-        results = []
-        
-        print(f"Parsing {len(data['results']['bindings'])} records...")
+    pages = []
+    status = 200
+    CACHE_DIR.mkdir(exist_ok=True)
+    
+    for offset in range(0, MAX_RECORDS, PAGE_SIZE):
+        page_query = query + f"LIMIT {PAGE_SIZE} OFFSET {offset}\n"
+        cache = CACHE_DIR / f"wd_{hashlib.sha1(page_query.encode()).hexdigest()}.csv"
         
-        for item in tqdm(data['results']['bindings']):
-            def get_val(key): return item.get(key, {}).get('value', None)
+        if not cache.exists():
+            # CSV results come back as plain values, so pandas parses them directly (no JSON step)
+            r = session.get(url, params={'format': 'csv', 'query': page_query}, stream=True)
             
-            celebrity = get_val('celebrityLabel')
-            spouse = get_val('spouseLabel')
-            start_date = get_val('start')
-            end_date = get_val('end')
-            end_cause = get_val('endCauseLabel')
-            country = get_val('countryLabel')
-            occupation = get_val('occupationLabel')
+            if r.status_code != 200:
+                status = r.status_code
+                break
             
-            # Clean Dates
-            if start_date: start_date = start_date.split('T')[0]
-            if end_date: end_date = end_date.split('T')[0]
-
-            results.append({
-                "Celebrity": celebrity,
-                "Spouse": spouse,
-                "Start_Date": start_date,
-                "End_Date": end_date,
-                "End_Cause": end_cause,
-                "Country": country,
-                "Occupation": occupation
-            })
-
-        df = pd.DataFrame(results)
+            # Stream the body to disk in chunks, then rename so a partial download is never reused
+            r.raw.decode_content = True
+            part = cache.with_suffix('.part')
+            with open(part, 'wb') as f:
+                shutil.copyfileobj(r.raw, f)
+            part.replace(cache)
+        
+        print(f"Parsing records {offset}-{offset + PAGE_SIZE}...")
+        page = pd.read_csv(cache, dtype=str, keep_default_na=False, na_values=[''])
+        pages.append(page)
+        
+        # A short page means the result set is exhausted
+        if len(page) < PAGE_SIZE:
+            break
+    
+    if status == 200:
+        df = pd.concat(pages, ignore_index=True).reindex(columns=list(COLUMNS)).rename(columns=COLUMNS)
+        
+        # Safeguard only: the ORDER BY should already make pages disjoint
+        df = df.drop_duplicates()
+        
+        # Clean Dates (Wikidata returns '1990-01-01T00:00:00Z', we want '1990-01-01')
+        df['Start_Date'] = df['Start_Date'].str.slice(0, 10)
+        df['End_Date'] = df['End_Date'].str.slice(0, 10)
         
         # Save
         filename = "celebrity_culture_profession.csv"
         df.to_csv(filename, index=False)
         
+        # Typed copy for step7: parsed dates + dictionary-encoded labels, so re-runs skip the text parse
+        parquet_file = "celebrity_culture_profession.parquet"
+        df_typed = df.copy()
+        for c in ('Start_Date', 'End_Date'):
+            df_typed[c] = pd.to_datetime(df_typed[c], format='%Y-%m-%d', errors='coerce')
+        for c in ('End_Cause', 'Country', 'Occupation'):
+            df_typed[c] = df_typed[c].astype('category')
+        try:
+            df_typed.to_parquet(parquet_file, engine='pyarrow', compression='zstd')
+            saved = f"'{filename}' (+ '{parquet_file}')"
+        except ImportError:
+            # pyarrow missing: the CSV alone is enough, step7 falls back to it
+            saved = f"'{filename}'"
+        
         print("-" * 30)
-        print(f"✅ Success! Saved '{filename}'")
+        print(f"✅ Success! Saved {saved}")
         print("New Variables:")
         print("1. Country (e.g., USA, India, UK)")
         print("2. Occupation (e.g., Actor, Musician)")
@@ -94,7 +142,7 @@ try:
         print(df.head())
         
     else:
-        print(f"❌ Wikidata Error: {r.status_code}")
+        print(f"❌ Wikidata Error: {status}")
 
 except Exception as e:
     print(f"❌ Script Error: {e}")
\ No newline at end of file
@@ -1,74 +1,142 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # File output only, no GUI backend needed
 import matplotlib.pyplot as plt
-import seaborn as sns
-from lifelines import KaplanMeierFitter
+
+# KM curves are long step functions: let Agg merge near-collinear segments
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 1.0
+
+def km(durations, events):
+    # Kaplan-Meier estimate: one sort, then S(t) = prod(1 - d_i / n_i) over the distinct times
+    order = np.argsort(durations, kind='stable')
+    t = durations[order]
+    times, first = np.unique(t, return_index=True)
+    n_at_risk = len(t) - first
+    deaths = np.add.reduceat(events[order], first)
+    surv = np.cumprod(1 - deaths / n_at_risk)
+    # Start the curve at (0, 1) like lifelines does
+    return np.r_[0, times], np.r_[1, surv]
+
+# Lowercased Wikidata country labels -> the name used in the plot (historical states fold into today's)
+COUNTRY_CANON = {
+    'united states': 'United States',
+    'united states of america': 'United States',
+    'united kingdom': 'United Kingdom',
+    'united kingdom of great britain and ireland': 'United Kingdom',
+    'kingdom of great britain': 'United Kingdom',
+    'india': 'India',
+    'republic of india': 'India',
+    'dominion of india': 'India',
+    'france': 'France',
+    'kingdom of france': 'France'
+}
 
 # --- 1. LOAD & DIAGNOSE ---
 print("📂 Loading Data...")
-df = pd.read_csv('celebrity_culture_profession.csv')
+# Only the columns used below. Prefer step6's typed Parquet copy unless the CSV is newer;
+# the CSV holds strict YYYY-MM-DD dates, so they are parsed at read time
+use_cols = ['Celebrity', 'Start_Date', 'End_Date', 'End_Cause', 'Country', 'Occupation']
+csv_file, parquet_file = 'celebrity_culture_profession.csv', 'celebrity_culture_profession.parquet'
+if os.path.exists(parquet_file) and os.path.getmtime(parquet_file) >= os.path.getmtime(csv_file):
+    df = pd.read_parquet(parquet_file, columns=use_cols)
+else:
+    df = pd.read_csv(
+        csv_file,
+        usecols=use_cols,
+        dtype={'Country': 'category', 'Occupation': 'string', 'End_Cause': 'string'},
+        parse_dates=['Start_Date', 'End_Date'],
+        date_format='%Y-%m-%d'
+    )
 
-# DIAGNOSTIC: Print the actual counts found in the file
+# DIAGNOSTIC: Print the actual counts found in the file (Country is a category, so this counts codes)
 print("\n--- 🌍 TOP 15 COUNTRIES FOUND ---")
 print(df['Country'].value_counts().head(15))
 print("---------------------------------\n")
 
-# Clean Data
-df['Start_Date'] = pd.to_datetime(df['Start_Date'], errors='coerce')
-df['End_Date'] = pd.to_datetime(df['End_Date'], errors='coerce')
-df = df.dropna(subset=['Start_Date'])
-
+# Clean Data (read_csv leaves a date column as text if any value fails to parse)
+for col in ['Start_Date', 'End_Date']:
+    if not pd.api.types.is_datetime64_any_dtype(df[col]):
+        df[col] = pd.to_datetime(df[col], format='%Y-%m-%d', errors='coerce', cache=True)
 today = pd.to_datetime('today')
+
+# Drop rows with no start or a non-positive duration before deriving any new columns
+bad = (
+    df['Start_Date'].isna()
+    | (df['End_Date'].notna() & (df['End_Date'] <= df['Start_Date']))
+    | (df['End_Date'].isna() & (df['Start_Date'] >= today))
+)
+df = df.loc[~bad].copy()
+
 df['Observed_End_Date'] = df['End_Date'].fillna(today)
-df['Duration_Years'] = (df['Observed_End_Date'] - df['Start_Date']).dt.days / 365.25
-df = df[df['Duration_Years'] > 0]
+# Subtract the raw datetime64 buffers and divide by a Julian year (no .dt.days Series); float32 is enough for the KM curves
+df['Duration_Years'] = ((df['Observed_End_Date'].to_numpy() - df['Start_Date'].to_numpy()) / np.timedelta64(31557600, 's')).astype(np.float32)
+
+# Event = 1 for a divorce (ended, and not by death); int8 is plenty for a 0/1 flag
+ended_by_death = df['End_Cause'].str.contains('death', case=False, na=False)
+df['Event'] = (df['End_Date'].notna() & ~ended_by_death).astype(np.int8)
 
-def get_status(row):
-    if pd.isnull(row['End_Date']): return 0
-    if 'death' in str(row['End_Cause']).lower(): return 0
-    return 1
-df['Event'] = df.apply(get_status, axis=1)
+# One lowercase pass + dictionary map; everything outside the mapping is 'Other'
+df['CountryNorm'] = df['Country'].str.lower().map(COUNTRY_CANON).fillna('Other').astype('category')
 
 # --- 2. THE FIX: RELAXED FILTERING ---
-# We look for partial matches to catch 'Republic of India' or 'India'
+# COUNTRY_CANON folds variants like 'Republic of India' into 'India'
 target_countries = ['United States', 'United Kingdom', 'India', 'France']
 colors = {'United States': 'blue', 'United Kingdom': 'red', 'India': 'green', 'France': 'purple'}
 
-plt.figure(figsize=(16, 8))
+# Both axes are created once; every curve is drawn onto an explicit Axes
+fig, (axL, axR) = plt.subplots(1, 2, figsize=(16, 8))
 
 # Plot 1: Profession
-plt.subplot(1, 2, 1)
-df_job = df[df['Occupation'].astype(str).str.contains('actor|musician|singer', case=False)].copy()
-df_job['Job_Group'] = np.where(df_job['Occupation'].str.contains('actor', case=False), 'Actor', 'Musician')
+# Lowercase once, then reuse the two masks for both the filter and the grouping
+occ = df['Occupation'].str.lower()
+is_actor = occ.str.contains('actor', na=False, regex=False)
+is_music = occ.str.contains('musician|singer', na=False, regex=True)
+mask = is_actor | is_music
+# Copy only the two columns the KM loop reads, not the whole filtered frame
+df_job = df.loc[mask, ['Duration_Years', 'Event']].copy()
+df_job['Job_Group'] = np.where(is_actor[mask].to_numpy(), 'Actor', 'Musician')
 
-kmf = KaplanMeierFitter()
 for job in ['Actor', 'Musician']:
-    mask = df_job['Job_Group'] == job
+    mask = (df_job['Job_Group'] == job).to_numpy()
     if mask.sum() > 10: # Lowered threshold
-        kmf.fit(df_job[mask]['Duration_Years'], df_job[mask]['Event'], label=f"{job} (n={mask.sum()})")
-        kmf.plot_survival_function(linewidth=3)
-plt.title('Musicians vs. Actors', fontsize=14)
-plt.grid(True, alpha=0.3)
+        t, s = km(df_job['Duration_Years'].to_numpy()[mask], df_job['Event'].to_numpy()[mask])
+        axL.step(t, s, where='post', linewidth=3, label=f"{job} (n={mask.sum()})")
+axL.set_title('Musicians vs. Actors', fontsize=14)
+axL.legend()
+axL.grid(True, alpha=0.3)
 
 # Plot 2: Culture (With Debugging)
-plt.subplot(1, 2, 2)
-
-for target in target_countries:
-    # Flexible search: matches "United States of America" if target is "United States"
-    mask = df['Country'].astype(str).str.contains(target, case=False, na=False)
-    
-    count = mask.sum()
-    if count > 5: # DRAMATICALLY LOWERED THRESHOLD (From 50 to 5)
-        # Grab the actual name used in the data for the label
-        actual_name = df[mask]['Country'].iloc[0]
-        kmf.fit(df[mask]['Duration_Years'], df[mask]['Event'], label=f"{actual_name} (n={count})")
-        kmf.plot_survival_function(linewidth=3, color=colors.get(target, 'grey'))
+durations = df['Duration_Years'].to_numpy()
+events = df['Event'].to_numpy()
+country_norm = df['CountryNorm']
+
+def _fit_one(target):
+    # Category equality: compares integer codes, no string scan
+    mask = (country_norm == target).to_numpy()
+    count = int(mask.sum())
+    if count <= 5: # DRAMATICALLY LOWERED THRESHOLD (From 50 to 5)
+        return None, None, count, target
+    t, s = km(durations[mask], events[mask])
+    return t, s, count, target
+
+# The fits are independent NumPy work, so run them in threads; plotting stays on the main thread
+with ThreadPoolExecutor(max_workers=len(target_countries)) as ex:
+    fits = list(ex.map(_fit_one, target_countries))
+
+for t, s, count, target in fits:
+    if t is not None:
+        axR.step(t, s, where='post', linewidth=3, color=colors.get(target, 'grey'), label=f"{target} (n={count})")
     else:
         print(f"⚠️ Warning: '{target}' has only {count} records. Line hidden.")
 
-plt.title('Culture: USA vs UK vs India vs France', fontsize=14)
-plt.grid(True, alpha=0.3)
+axR.set_title('Culture: USA vs UK vs India vs France', fontsize=14)
+axR.legend()
+axR.grid(True, alpha=0.3)
 
-plt.tight_layout()
-plt.savefig('culture_profession_dashboard_v2.png')
+fig.tight_layout()
+fig.savefig('culture_profession_dashboard_v2.png', dpi=120)
 print("\n✅ Dashboard Saved: culture_profession_dashboard_v2.png")
\ No newline at end of file